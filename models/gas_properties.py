@@ -67,7 +67,8 @@ def cp(T, gas="air", use_const=False):
         return GAS_PROPERTIES[gas]["cp_const"]
     
     a, b, c, d = GAS_PROPERTIES[gas]["cp_coeffs"]
-    return a + b*T + c*T**2 + d*T**3
+    # Horner-Schema für a + b*T + c*T^2 + d*T^3
+    return a + T*(b + T*(c + T*d))
 
 
 def cp_mean(T1, T2, gas="air", use_const=False):
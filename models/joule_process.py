@@ -11,6 +11,14 @@ from utils import converters  # Anstatt import converters
 from utils.converters import celsius_to_kelvin, kelvin_to_celsius, bar_to_pascal, pascal_to_bar
 
 
+# Reihenfolge der Zustände für Tabellen und Diagramme
+# (unbekannte Schlüssel werden in Einfügereihenfolge hinten angestellt)
+_STATE_ORDER = {
+    1: 0, 2: 1, "2*": 2, "2s": 3, 3: 4, 4: 5, "4*": 6, "4s": 7,
+    "2a": 8, "2a_s": 9, "2b": 10, "2c": 11, "2c_s": 12,
+}
+
+
 class JouleProcessCalculator:
     """
     Berechnet einen JOULE-Prozess mit detailliertem Rechenweg
@@ -21,6 +29,9 @@ class JouleProcessCalculator:
         self.steps = []  # Speichert alle Berechnungsschritte
         self.states = {}  # Speichert die Zustandsgrößen
         self.step_categories = {}  # Speichert die Schritte nach Kategorien
+        self._sorted_state_keys = None  # Zwischenspeicher für die sortierten Zustandsschlüssel
+        self._sorted_state_keys_src = None  # Schlüssel, aus denen der Zwischenspeicher erstellt wurde
+        self._process_properties = None  # Zwischenspeicher für calculate_process_properties (bei Zustands- oder Parameteränderung verworfen)
         
         # Konstanten für das Arbeitsfluid
         self.R = GAS_PROPERTIES[gas]["R"]
@@ -41,6 +52,45 @@ class JouleProcessCalculator:
         self.intercooling_temperature = None
         self.intercooling_pressure_ratio = None
     
+    @property
+    def regeneration(self):
+        """Gibt an, ob die Regeneration aktiviert ist"""
+        return self._regeneration
+    
+    @regeneration.setter
+    def regeneration(self, value):
+        self._regeneration = value
+        # Die zwischengespeicherten Prozesseigenschaften hängen von der Regeneration ab
+        self._process_properties = None
+    
+    @property
+    def mass_flow(self):
+        """Massestrom in kg/s (None, wenn nicht vorgegeben)"""
+        return self._mass_flow
+    
+    @mass_flow.setter
+    def mass_flow(self, value):
+        self._mass_flow = value
+        # Die zwischengespeicherten Leistungen hängen vom Massestrom ab
+        self._process_properties = None
+    
+    def get_sorted_state_keys(self):
+        """
+        Gibt die Schlüssel der berechneten Zustände in Prozessreihenfolge zurück
+        
+        Die Sortierung wird zwischengespeichert und nur neu erstellt, wenn sich
+        die Menge der Zustände seit dem letzten Aufruf geändert hat.
+        
+        Returns:
+        list:
+            Sortierte Zustandsschlüssel (z.B. [1, 2, '2*', '2s', 3, 4, '4*', '4s'])
+        """
+        keys = tuple(self.states)
+        if self._sorted_state_keys is None or self._sorted_state_keys_src != keys:
+            self._sorted_state_keys = sorted(keys, key=lambda key: _STATE_ORDER.get(key, len(_STATE_ORDER)))
+            self._sorted_state_keys_src = keys
+        return self._sorted_state_keys
+    
     def _add_step(self, title, formula=None, calculation=None, result=None, unit=None, category="Allgemein"):
         """
         Fügt einen Berechnungsschritt hinzu
@@ -180,6 +230,7 @@ class JouleProcessCalculator:
         )
         
         self.states[1] = {"p": p1, "T": T1, "v": v1, "h": h1, "s": s1}
+        self._process_properties = None
     
     def calculate_state_2_isentropic(self, p2):
         """
@@ -431,6 +482,7 @@ class JouleProcessCalculator:
         )
         
         self.states[2] = {"p": p2, "T": T2, "v": v2, "h": h2, "s": s2}
+        self._process_properties = None
     
     def calculate_state_2_with_intercooling(self, p2):
         """
@@ -663,6 +715,7 @@ class JouleProcessCalculator:
         
         # Zustand 2c als Zustand 2 speichern für die Kompatibilität mit dem restlichen Code
         self.states[2] = self.states["2c"].copy()
+        self._process_properties = None
     
     def calculate_state_3(self, p3, T3):
         """
@@ -766,6 +819,7 @@ class JouleProcessCalculator:
         )
         
         self.states[3] = {"p": p3, "T": T3, "v": v3, "h": h3, "s": s3}
+        self._process_properties = None
 
     def calculate_state_4_isentropic(self, p4):
         """
@@ -1017,6 +1071,7 @@ class JouleProcessCalculator:
         )
         
         self.states[4] = {"p": p4, "T": T4, "v": v4, "h": h4, "s": s4}
+        self._process_properties = None
 
     def calculate_optimal_pressure_ratio(self):
         """
@@ -1251,15 +1306,23 @@ class JouleProcessCalculator:
         
         # Zustand 4* speichern
         self.states["4*"] = {"p": p4_star, "T": T4_star, "v": v4_star, "h": h4_star, "s": s4_star}
+        self._process_properties = None
     
     def calculate_process_properties(self):
         """
         Berechnet die Prozesseigenschaften wie Arbeit, Wärme und Wirkungsgrad
         
+        Das Ergebnis wird zwischengespeichert, bis sich Parameter oder Zustände
+        ändern. Wiederholte Aufrufe (Bildschirmausgabe, PDF-Export) liefern dann
+        dasselbe Dictionary, ohne Rechnung und Rechenschritte erneut zu erzeugen.
+        
         Returns:
         dict:
             Dictionary mit den Prozesseigenschaften
         """
+        if self._process_properties is not None:
+            return self._process_properties
+        
         # Prüfen, ob Zwischenkühlung verwendet wurde
         has_intercooling = "2a" in self.states and "2b" in self.states and "2c" in self.states
         
@@ -1493,4 +1556,5 @@ class JouleProcessCalculator:
             tau = self.states[3]["T"] / self.states[1]["T"]
             process_properties["tau"] = tau
         
+        self._process_properties = process_properties
         return process_properties
\ No newline at end of file
@@ -4,16 +4,19 @@ Contains widget-based UI elements for interactive calculations.
 Extended with intercooling functionality.
 """
 
+import asyncio
+
 import ipywidgets as widgets
 from IPython.display import display, HTML
 import matplotlib.pyplot as plt
+from matplotlib.transforms import offset_copy
 import numpy as np
 
 from models.gas_properties import GAS_PROPERTIES
 from models.joule_process import JouleProcessCalculator
-from utils.converters import bar_to_pascal
+from utils.converters import bar_to_pascal, PA_PER_BAR
 from visualization.results_formatter import print_results_table, material_properties_table
-from visualization.plotting import plot_process, custom_sort_key
+from visualization.plotting import plot_process, _DIAGRAM_SPECS
 
 
 def create_joule_calculator_ui():
@@ -248,6 +251,9 @@ def create_joule_calculator_ui():
     # Store the current calculator instance
     current_calc = {'instance': None}
     
+    # Figuren je Diagrammtyp, die bei jeder Berechnung wiederverwendet werden
+    figure_cache = {}
+    
     # Dropdown to select calculation step categories
     step_category_dropdown = widgets.Dropdown(
         options=[('All Steps', None)],
@@ -399,8 +405,8 @@ def create_joule_calculator_ui():
                     try:
                         export_calculation_to_pdf(current_calc['instance'], f"{filename}.pdf", include_plots=True)
                     except ImportError:
-                        print("Für den PDF-Export wird fpdf benötigt.")
-                        print("Installiere mit: pip install fpdf")
+                        print("Für den PDF-Export wird fpdf2 benötigt.")
+                        print("Installiere mit: pip install fpdf2")
                         print("Alternativ wähle ein anderes Format.")
                 else:
                     from visualization.results_formatter import print_calculation_steps
@@ -418,7 +424,8 @@ def create_joule_calculator_ui():
     export_button.on_click(export_calculation)
     
     # NEUE FUNKTION: Plot des Prozesses mit Zwischenkühlung
-    def plot_process_with_intercooling(joule_calc, diagram_type="Ts", save_fig=False, filename=None, show_points=True):
+    def plot_process_with_intercooling(joule_calc, diagram_type="Ts", save_fig=False, filename=None, show_points=True,
+                                       ax=None):
         """
         Zeichnet einen JOULE-Prozess mit Zwischenkühlung
         
@@ -433,32 +440,26 @@ def create_joule_calculator_ui():
             Dateiname für die gespeicherte Figur
         show_points : bool
             Wenn True, werden die Zustandspunkte im Diagramm angezeigt
+        ax : matplotlib.axes.Axes
+            Optional: Vorhandene (leere) Achse, in die gezeichnet wird, anstatt eine neue Figur zu erzeugen
         """
         # Überprüfen, ob alle grundlegenden Zustände berechnet wurden
         if not all(i in joule_calc.states for i in [1, 2, 3, 4]):
             raise ValueError("Alle grundlegenden Zustände (1, 2, 3, 4) müssen berechnet sein.")
         
-        fig, ax = plt.subplots(figsize=(10, 6), dpi=120)
+        if ax is None:
+            # Constrained Layout ordnet die Achsen erst beim Zeichnen an
+            fig, ax = plt.subplots(figsize=(10, 6), dpi=120, constrained_layout=True)
+        else:
+            fig = ax.figure
         
         # Zustandspunkte extrahieren mit benutzerdefinierter Sortierfunktion
-        points = {}
-        for i in sorted(joule_calc.states.keys(), key=custom_sort_key):
-            points[i] = joule_calc.states[i]
+        points = {i: joule_calc.states[i] for i in joule_calc.get_sorted_state_keys()}
         
         # Diagramm-Typ
-        if diagram_type == "Ts":
-            x_key, y_key = "s", "T"
-            xlabel, ylabel = "Entropie s [J/(kg·K)]", "Temperatur T [K]"
-            title = "T-s-Diagramm des JOULE-Prozesses"
-        elif diagram_type == "pv":
-            x_key, y_key = "v", "p"
-            xlabel, ylabel = "Spezifisches Volumen v [m³/kg]", "Druck p [bar]"
-            title = "p-v-Diagramm des JOULE-Prozesses"
-        elif diagram_type == "hs":
-            x_key, y_key = "h", "s"
-            xlabel, ylabel = "Spezifische Enthalpie h [J/kg]", "Entropie s [J/(kg·K)]"
-            title = "h-s-Diagramm des JOULE-Prozesses"
-        else:
+        try:
+            x_key, y_key, xlabel, ylabel, title = _DIAGRAM_SPECS[diagram_type]
+        except KeyError:
             raise ValueError(f"Unbekannter Diagramm-Typ: {diagram_type}")
         
         # Prüfen, ob Zwischenkühlung aktiv ist
@@ -467,28 +468,35 @@ def create_joule_calculator_ui():
         if has_intercooling:
             title += " mit Zwischenkühlung"
         
+        # Umrechnung der y-Werte einmalig festlegen (Drücke werden in bar dargestellt)
+        to_y = (lambda v: v / PA_PER_BAR) if y_key == "p" else (lambda v: v)
+        
+        # Achsen anpassen (vor dem Zeichnen, damit alle Elemente direkt im
+        # logarithmischen Koordinatensystem angelegt werden)
+        if diagram_type == "pv":
+            ax.set_xscale('log')  # Logarithmische x-Achse für p-v-Diagramm
+            ax.set_yscale('log')  # Logarithmische y-Achse für p-v-Diagramm
+        
         # Punktkoordinaten vorbereiten
         x_vals = []
         y_vals = []
         labels = []
         for label, point in points.items():
             x_val = point[x_key]
-            y_val = point[y_key]
-            if y_key == "p":
-                from utils.converters import pascal_to_bar
-                y_val = pascal_to_bar(y_val)  # Pa zu bar
+            y_val = to_y(point[y_key])
             x_vals.append(x_val)
             y_vals.append(y_val)
             labels.append(str(label))
         
         # Punkte zeichnen
         if show_points:
-            ax.scatter(x_vals, y_vals, s=80, c='blue', zorder=3)
+            ax.plot(x_vals, y_vals, 'o', markersize=9, markerfacecolor='blue', markeredgecolor='blue',
+                    linestyle='None', zorder=3)
             
-            # Beschriftungen hinzufügen
-            for i, label in enumerate(labels):
-                ax.annotate(label, (x_vals[i], y_vals[i]), fontsize=12, 
-                        xytext=(10, 10), textcoords='offset points')
+            # Beschriftungen hinzufügen (gemeinsame Transformation mit 10 pt Versatz)
+            label_transform = offset_copy(ax.transData, fig=fig, x=10, y=10, units='points')
+            for x_val, y_val, label in zip(x_vals, y_vals, labels):
+                ax.text(x_val, y_val, label, fontsize=12, transform=label_transform)
         
         # Linien zwischen den Zuständen zeichnen
         if has_intercooling:
@@ -497,55 +505,46 @@ def create_joule_calculator_ui():
                 # Mit Regeneration und Zwischenkühlung
                 # 1 -> 2a (erste Verdichtung)
                 ax.plot([points[1][x_key], points["2a"][x_key]], 
-                        [points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key]), 
-                        points["2a"][y_key] if y_key != "p" else pascal_to_bar(points["2a"][y_key])], 
+                        [to_y(points[1][y_key]), to_y(points["2a"][y_key])], 
                         'k-', linewidth=2)
                 # 2a -> 2b (Zwischenkühlung)
                 ax.plot([points["2a"][x_key], points["2b"][x_key]], 
-                        [points["2a"][y_key] if y_key != "p" else pascal_to_bar(points["2a"][y_key]), 
-                        points["2b"][y_key] if y_key != "p" else pascal_to_bar(points["2b"][y_key])], 
+                        [to_y(points["2a"][y_key]), to_y(points["2b"][y_key])], 
                         'b-', linewidth=2)
                 # 2b -> 2c (zweite Verdichtung)
                 ax.plot([points["2b"][x_key], points["2c"][x_key]], 
-                        [points["2b"][y_key] if y_key != "p" else pascal_to_bar(points["2b"][y_key]), 
-                        points["2c"][y_key] if y_key != "p" else pascal_to_bar(points["2c"][y_key])], 
+                        [to_y(points["2b"][y_key]), to_y(points["2c"][y_key])], 
                         'k-', linewidth=2)
                 # 2c -> 2* (Regeneration)
                 ax.plot([points["2c"][x_key], points["2*"][x_key]], 
-                        [points["2c"][y_key] if y_key != "p" else pascal_to_bar(points["2c"][y_key]), 
-                        points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key])], 
+                        [to_y(points["2c"][y_key]), to_y(points["2*"][y_key])], 
                         'k--', linewidth=2)
                 # 2* -> 3 (Erhitzung)
                 ax.plot([points["2*"][x_key], points[3][x_key]], 
-                        [points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key]), 
-                        points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key])], 
+                        [to_y(points["2*"][y_key]), to_y(points[3][y_key])], 
                         'r-', linewidth=2)
                 # 3 -> 4 (Expansion)
                 ax.plot([points[3][x_key], points[4][x_key]], 
-                        [points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key]), 
-                        points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key])], 
+                        [to_y(points[3][y_key]), to_y(points[4][y_key])], 
                         'k-', linewidth=2)
                 # 4 -> 4* (Regeneration)
                 ax.plot([points[4][x_key], points["4*"][x_key]], 
-                        [points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]), 
-                        points["4*"][y_key] if y_key != "p" else pascal_to_bar(points["4*"][y_key])], 
+                        [to_y(points[4][y_key]), to_y(points["4*"][y_key])], 
                         'k--', linewidth=2)
                 # 4* -> 1 (Kühlung)
                 ax.plot([points["4*"][x_key], points[1][x_key]], 
-                        [points["4*"][y_key] if y_key != "p" else pascal_to_bar(points["4*"][y_key]), 
-                        points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key])], 
+                        [to_y(points["4*"][y_key]), to_y(points[1][y_key])], 
                         'b-', linewidth=2)
                 # Regeneration: 4 -> 2*
                 ax.plot([points[4][x_key], points["2*"][x_key]], 
-                        [points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]), 
-                        points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key])], 
-                        'r--', linewidth=1)
+                        [to_y(points[4][y_key]), to_y(points["2*"][y_key])], 
+                        'r--', linewidth=1, rasterized=True)
             else:
                 # Mit Zwischenkühlung aber ohne Regeneration
                 # 1 -> 2a -> 2b -> 2c -> 3 -> 4 -> 1
                 states_order = [1, "2a", "2b", "2c", 3, 4, 1]
                 x_cycle = [points[state][x_key] for state in states_order]
-                y_cycle = [points[state][y_key] if y_key != "p" else pascal_to_bar(points[state][y_key]) 
+                y_cycle = [to_y(points[state][y_key]) 
                           for state in states_order]
                 ax.plot(x_cycle, y_cycle, 'k-', linewidth=2)
         else:
@@ -555,23 +554,22 @@ def create_joule_calculator_ui():
                 # Alle relevanten Punkte verbinden
                 cycle_points = [1, 2, "2*", 3, 4, "4*", 1]
                 x_cycle = [points[state][x_key] for state in cycle_points]
-                y_cycle = [points[state][y_key] if y_key != "p" else pascal_to_bar(points[state][y_key]) 
+                y_cycle = [to_y(points[state][y_key]) 
                          for state in cycle_points]
                 ax.plot(x_cycle, y_cycle, 'k-', linewidth=2)
                 
                 # Regeneration: 4 -> 2*
                 ax.plot([points[4][x_key], points["2*"][x_key]], 
-                        [points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]), 
-                         points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key])], 
-                        'r--', linewidth=1)
+                        [to_y(points[4][y_key]), to_y(points["2*"][y_key])], 
+                        'r--', linewidth=1, rasterized=True)
             else:
                 # Basiszyklus ohne Regeneration oder Zwischenkühlung
                 x_cycle = [points[1][x_key], points[2][x_key], points[3][x_key], points[4][x_key], points[1][x_key]]
-                y_cycle = [points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key]),
-                          points[2][y_key] if y_key != "p" else pascal_to_bar(points[2][y_key]),
-                          points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key]),
-                          points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]),
-                          points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key])]
+                y_cycle = [to_y(points[1][y_key]),
+                          to_y(points[2][y_key]),
+                          to_y(points[3][y_key]),
+                          to_y(points[4][y_key]),
+                          to_y(points[1][y_key])]
                 ax.plot(x_cycle, y_cycle, 'k-', linewidth=2)
         
         # Diagramm-Eigenschaften
@@ -580,11 +578,6 @@ def create_joule_calculator_ui():
         ax.set_title(title, fontsize=14)
         ax.grid(True, linestyle='--', alpha=0.7)
         
-        # Achsen anpassen
-        if diagram_type == "pv":
-            ax.set_xscale('log')  # Logarithmische x-Achse für p-v-Diagramm
-            ax.set_yscale('log')  # Logarithmische y-Achse für p-v-Diagramm
-        
         # Legende
         legend_elements = []
         if has_intercooling:
@@ -598,10 +591,8 @@ def create_joule_calculator_ui():
         if legend_elements:
             ax.legend(handles=legend_elements)
         
-        plt.tight_layout()
-        
         if save_fig and filename:
-            plt.savefig(filename, dpi=300, bbox_inches='tight')
+            fig.savefig(filename, dpi=300, bbox_inches='tight')
         
         return fig, ax
     
@@ -720,16 +711,27 @@ def create_joule_calculator_ui():
                 # Zustandsgrößen-Tabelle
                 print_results_table(calc)
                 
-                # Stoffwerte anzeigen
-                if show_material_props_checkbox.value:
+                # Stoffwerte anzeigen (nur wenn der Ausgabebereich sichtbar ist)
+                if show_material_props_checkbox.value and output.layout.display != 'none':
                     material_properties_table(calc)
                 
+                # Figur für den Diagrammtyp wiederverwenden oder einmalig anlegen
+                diagram_type = diagram_dropdown.value
+                if diagram_type not in figure_cache:
+                    fig, ax = plt.subplots(figsize=(10, 6), dpi=120, constrained_layout=True)
+                    # Die Figur wird über display() ausgegeben und nicht von pyplot verwaltet,
+                    # damit sie nicht bei jeder Interaktion erneut gezeichnet wird
+                    plt.close(fig)
+                    figure_cache[diagram_type] = (fig, ax)
+                fig, ax = figure_cache[diagram_type]
+                ax.clear()
+                
                 # Diagramm zeichnen (mit angepasster Funktion für Zwischenkühlung)
                 if intercooling:
-                    fig, ax = plot_process_with_intercooling(calc, diagram_type=diagram_dropdown.value)
+                    plot_process_with_intercooling(calc, diagram_type=diagram_type, ax=ax)
                 else:
-                    fig, ax = plot_process(calc, diagram_type=diagram_dropdown.value)
-                plt.show()
+                    plot_process(calc, diagram_type=diagram_type, ax=ax)
+                display(fig)
                 
                 # Enable calculation step controls
                 step_category_dropdown.disabled = False
@@ -747,7 +749,29 @@ def create_joule_calculator_ui():
                 import traceback
                 traceback.print_exc()
     
+    # Verzögerte Neuberechnung für Live-Updates über observe: schnell aufeinander
+    # folgende Änderungen werden zu einer einzigen Berechnung zusammengefasst
+    # (auf der Ereignisschleife des Kernels, also im selben Thread wie alle
+    # anderen Widget-Callbacks, da Ausgabe und matplotlib nicht threadsicher sind)
+    debounce_handle = [None]
+    
+    def calculate_debounced(*args):
+        # Ohne vorherige Berechnung gibt es nichts zu aktualisieren
+        if current_calc['instance'] is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Keine laufende Ereignisschleife (z.B. außerhalb eines Kernels): direkt berechnen
+            calculate(None)
+            return
+        if debounce_handle[0] is not None:
+            debounce_handle[0].cancel()
+        debounce_handle[0] = loop.call_later(0.15, calculate, None)
+    
+    # Der Button berechnet direkt, Änderungen des Diagrammtyps verzögert
     calculate_button.on_click(calculate)
+    diagram_dropdown.observe(calculate_debounced, 'value')
     
     # Layout erstellen
     gas_params = widgets.VBox([
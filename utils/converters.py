@@ -1,20 +1,27 @@
 """
 Unit conversion utilities for the JOULE process calculator.
+
+Alle Funktionen akzeptieren neben skalaren Werten auch numpy-Arrays.
 """
 
+# Umrechnungskonstanten (für vektorisierte Umrechnungen ohne Funktionsaufruf)
+_ABS_ZERO = 273.15  # Nullpunkt der Celsius-Skala in K
+PA_PER_BAR = 1e5  # Pa pro bar
+
+
 def celsius_to_kelvin(T_celsius):
     """
     Konvertiert Temperatur von Celsius nach Kelvin
     
     Parameter:
-    T_celsius : float
+    T_celsius : float oder numpy.ndarray
         Temperatur in °C
         
     Returns:
-    float
+    float oder numpy.ndarray
         Temperatur in K
     """
-    return T_celsius + 273.15
+    return T_celsius + _ABS_ZERO
 
 
 def kelvin_to_celsius(T_kelvin):
@@ -22,14 +29,14 @@ def kelvin_to_celsius(T_kelvin):
     Konvertiert Temperatur von Kelvin nach Celsius
     
     Parameter:
-    T_kelvin : float
+    T_kelvin : float oder numpy.ndarray
         Temperatur in K
         
     Returns:
-    float
+    float oder numpy.ndarray
         Temperatur in °C
     """
-    return T_kelvin - 273.15
+    return T_kelvin - _ABS_ZERO
 
 
 def bar_to_pascal(p_bar):
@@ -37,14 +44,14 @@ def bar_to_pascal(p_bar):
     Konvertiert Druck von Bar nach Pascal
     
     Parameter:
-    p_bar : float
+    p_bar : float oder numpy.ndarray
         Druck in bar
         
     Returns:
-    float
+    float oder numpy.ndarray
         Druck in Pa
     """
-    return p_bar * 1e5
+    return p_bar * PA_PER_BAR
 
 
 def pascal_to_bar(p_pascal):
@@ -52,11 +59,11 @@ def pascal_to_bar(p_pascal):
     Konvertiert Druck von Pascal nach Bar
     
     Parameter:
-    p_pascal : float
+    p_pascal : float oder numpy.ndarray
         Druck in Pa
         
     Returns:
-    float
+    float oder numpy.ndarray
         Druck in bar
     """
-    return p_pascal / 1e5
\ No newline at end of file
+    return p_pascal / PA_PER_BAR
\ No newline at end of file
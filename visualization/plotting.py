@@ -3,37 +3,39 @@ Plotting functions for the JOULE process calculator.
 Creates diagrams of the thermodynamic cycle.
 """
 
-import matplotlib.pyplot as plt
-from utils.converters import pascal_to_bar
+from utils.converters import PA_PER_BAR
 
-def custom_sort_key(key):
+# matplotlib wird erst beim ersten Zeichnen importiert (siehe _load_matplotlib),
+# damit der Import dieses Moduls den Start des Notebooks nicht verzögert
+plt = None
+LineCollection = None
+offset_copy = None
+
+# Achsenzuordnung, Achsenbeschriftungen und Titel je Diagramm-Typ
+# (x_key, y_key, xlabel, ylabel, title)
+_DIAGRAM_SPECS = {
+    "Ts": ("s", "T", "Entropie s [J/(kg·K)]", "Temperatur T [K]",
+           "T-s-Diagramm des JOULE-Prozesses"),
+    "pv": ("v", "p", "Spezifisches Volumen v [m³/kg]", "Druck p [bar]",
+           "p-v-Diagramm des JOULE-Prozesses"),
+    "hs": ("h", "s", "Spezifische Enthalpie h [J/kg]", "Entropie s [J/(kg·K)]",
+           "h-s-Diagramm des JOULE-Prozesses"),
+}
+
+def _load_matplotlib():
     """
-    Custom sorting function for mixed key types (int and str)
-    
-    Parameters:
-    key : object
-        The key to sort
-        
-    Returns:
-    tuple:
-        Sorting criteria tuple
+    Importiert matplotlib beim ersten Aufruf und legt die Modulreferenzen ab
     """
-    if isinstance(key, int):
-        return key, ""  # Numbers first, no suffix
-    else:
-        # String keys like "2*" or "4s"
-        try:
-            # Extract the numeric part
-            if key.rstrip("*s").isdigit():
-                num = int(key.rstrip("*s"))
-                suffix = key[len(str(num)):]
-                return num, suffix
-            else:
-                return float('inf'), key  # Fallback
-        except (ValueError, AttributeError):
-            return float('inf'), key  # Fallback for non-string, non-int keys
+    global plt, LineCollection, offset_copy
+    if plt is not None:
+        return
+    
+    import matplotlib.pyplot as _plt
+    from matplotlib.collections import LineCollection as _LineCollection
+    from matplotlib.transforms import offset_copy as _offset_copy
+    plt, LineCollection, offset_copy = _plt, _LineCollection, _offset_copy
 
-def plot_process(joule_calc, diagram_type="Ts", save_fig=False, filename=None, show_points=True):
+def plot_process(joule_calc, diagram_type="Ts", save_fig=False, filename=None, show_points=True, ax=None):
     """
     Zeichnet den Prozess in einem Diagramm
     
@@ -48,102 +50,92 @@ def plot_process(joule_calc, diagram_type="Ts", save_fig=False, filename=None, s
         Dateiname für die gespeicherte Figur
     show_points : bool
         Wenn True, werden die Zustandspunkte im Diagramm angezeigt
+    ax : matplotlib.axes.Axes
+        Optional: Vorhandene (leere) Achse, in die gezeichnet wird, anstatt eine neue Figur zu erzeugen
     """
     if not all(i in joule_calc.states for i in [1, 2, 3, 4]):
         raise ValueError("Alle Zustände (1, 2, 3, 4) müssen berechnet sein.")
     
-    fig, ax = plt.subplots(figsize=(10, 6), dpi=120)
+    _load_matplotlib()
+    
+    if ax is None:
+        # Constrained Layout ordnet die Achsen erst beim Zeichnen an
+        fig, ax = plt.subplots(figsize=(10, 6), dpi=120, constrained_layout=True)
+    else:
+        fig = ax.figure
     
     # Zustandspunkte extrahieren mit benutzerdefinierter Sortierfunktion
-    points = {}
-    for i in sorted(joule_calc.states.keys(), key=custom_sort_key):
-        points[i] = joule_calc.states[i]
+    points = {i: joule_calc.states[i] for i in joule_calc.get_sorted_state_keys()}
     
     # Diagramm-Typ
-    if diagram_type == "Ts":
-        x_key, y_key = "s", "T"
-        xlabel, ylabel = "Entropie s [J/(kg·K)]", "Temperatur T [K]"
-        title = "T-s-Diagramm des JOULE-Prozesses"
-    elif diagram_type == "pv":
-        x_key, y_key = "v", "p"
-        xlabel, ylabel = "Spezifisches Volumen v [m³/kg]", "Druck p [bar]"
-        title = "p-v-Diagramm des JOULE-Prozesses"
-    elif diagram_type == "hs":
-        x_key, y_key = "h", "s"
-        xlabel, ylabel = "Spezifische Enthalpie h [J/kg]", "Entropie s [J/(kg·K)]"
-        title = "h-s-Diagramm des JOULE-Prozesses"
-    else:
+    try:
+        x_key, y_key, xlabel, ylabel, title = _DIAGRAM_SPECS[diagram_type]
+    except KeyError:
         raise ValueError(f"Unbekannter Diagramm-Typ: {diagram_type}")
     
+    # Umrechnung der y-Werte einmalig festlegen (Drücke werden in bar dargestellt)
+    to_y = (lambda v: v / PA_PER_BAR) if y_key == "p" else (lambda v: v)
+    
+    # Achsen anpassen (vor dem Zeichnen, damit alle Elemente direkt im
+    # logarithmischen Koordinatensystem angelegt werden)
+    if diagram_type == "pv":
+        ax.set_xscale('log')  # Logarithmische x-Achse für p-v-Diagramm
+        ax.set_yscale('log')  # Logarithmische y-Achse für p-v-Diagramm
+    
     # Punktkoordinaten vorbereiten
     x_vals = []
     y_vals = []
     labels = []
+    coords = {}
     for label, point in points.items():
         x_val = point[x_key]
-        y_val = point[y_key]
-        if y_key == "p":
-            y_val = pascal_to_bar(y_val)  # Pa zu bar
+        y_val = to_y(point[y_key])
         x_vals.append(x_val)
         y_vals.append(y_val)
         labels.append(str(label))
+        coords[label] = (x_val, y_val)
     
     # Punkte zeichnen
     if show_points:
-        ax.scatter(x_vals, y_vals, s=80, c='blue', zorder=3)
+        ax.plot(x_vals, y_vals, 'o', markersize=9, markerfacecolor='blue', markeredgecolor='blue',
+                linestyle='None', zorder=3)
         
-        # Beschriftungen hinzufügen
-        for i, label in enumerate(labels):
-            ax.annotate(label, (x_vals[i], y_vals[i]), fontsize=12, 
-                       xytext=(10, 10), textcoords='offset points')
+        # Beschriftungen hinzufügen (gemeinsame Transformation mit 10 pt Versatz)
+        label_transform = offset_copy(ax.transData, fig=fig, x=10, y=10, units='points')
+        for x_val, y_val, label in zip(x_vals, y_vals, labels):
+            ax.text(x_val, y_val, label, fontsize=12, transform=label_transform)
     
     # Linien zwischen den Zuständen zeichnen
     if joule_calc.regeneration and "2*" in joule_calc.states and "4*" in joule_calc.states:
         # Mit Regeneration
-        # 1 -> 2
-        ax.plot([points[1][x_key], points[2][x_key]], 
-                [points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key]), 
-                 points[2][y_key] if y_key != "p" else pascal_to_bar(points[2][y_key])], 
-                'k-', linewidth=2)
-        # 2 -> 2*
-        ax.plot([points[2][x_key], points["2*"][x_key]], 
-                [points[2][y_key] if y_key != "p" else pascal_to_bar(points[2][y_key]), 
-                 points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key])], 
-                'k--', linewidth=2)
-        # 2* -> 3
-        ax.plot([points["2*"][x_key], points[3][x_key]], 
-                [points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key]), 
-                 points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key])], 
-                'k-', linewidth=2)
-        # 3 -> 4
-        ax.plot([points[3][x_key], points[4][x_key]], 
-                [points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key]), 
-                 points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key])], 
-                'k-', linewidth=2)
-        # 4 -> 4*
-        ax.plot([points[4][x_key], points["4*"][x_key]], 
-                [points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]), 
-                 points["4*"][y_key] if y_key != "p" else pascal_to_bar(points["4*"][y_key])], 
-                'k--', linewidth=2)
-        # 4* -> 1
-        ax.plot([points["4*"][x_key], points[1][x_key]], 
-                [points["4*"][y_key] if y_key != "p" else pascal_to_bar(points["4*"][y_key]), 
-                 points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key])], 
-                'k-', linewidth=2)
-        # Regeneration: 4 -> 2*
-        ax.plot([points[4][x_key], points["2*"][x_key]], 
-                [points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]), 
-                 points["2*"][y_key] if y_key != "p" else pascal_to_bar(points["2*"][y_key])], 
-                'r--', linewidth=1)
+        # Alle Teilstrecken als Liniensegmente sammeln und gemeinsam zeichnen
+        solid_segs = [
+            [coords[1], coords[2]],        # 1 -> 2
+            [coords["2*"], coords[3]],     # 2* -> 3
+            [coords[3], coords[4]],        # 3 -> 4
+            [coords["4*"], coords[1]],     # 4* -> 1
+        ]
+        dashed_segs = [
+            [coords[2], coords["2*"]],     # 2 -> 2*
+            [coords[4], coords["4*"]],     # 4 -> 4*
+        ]
+        ax.add_collection(LineCollection(solid_segs, colors='k', linewidths=2))
+        ax.add_collection(LineCollection(dashed_segs, colors='k', linewidths=2, linestyles='--'))
+        # Regeneration: 4 -> 2* (als Rastergrafik, damit die Strichelung in
+        # Vektorausgaben wie PDF nicht aus vielen Einzelelementen besteht)
+        heat_transfer = LineCollection([[coords[4], coords["2*"]]], colors='r', linewidths=1, linestyles='--')
+        heat_transfer.set_rasterized(True)
+        ax.add_collection(heat_transfer)
+        ax.autoscale_view()
     else:
         # Ohne Regeneration
         # Alle Punkte der Reihe nach verbinden und am Ende zum Anfang zurück
         x_cycle = [points[1][x_key], points[2][x_key], points[3][x_key], points[4][x_key], points[1][x_key]]
-        y_cycle = [points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key]),
-                  points[2][y_key] if y_key != "p" else pascal_to_bar(points[2][y_key]),
-                  points[3][y_key] if y_key != "p" else pascal_to_bar(points[3][y_key]),
-                  points[4][y_key] if y_key != "p" else pascal_to_bar(points[4][y_key]),
-                  points[1][y_key] if y_key != "p" else pascal_to_bar(points[1][y_key])]
+        y_cycle = [to_y(points[1][y_key]),
+                  to_y(points[2][y_key]),
+                  to_y(points[3][y_key]),
+                  to_y(points[4][y_key]),
+                  to_y(points[1][y_key])]
         ax.plot(x_cycle, y_cycle, 'k-', linewidth=2)
     
     # Diagramm-Eigenschaften
@@ -152,11 +144,6 @@ def plot_process(joule_calc, diagram_type="Ts", save_fig=False, filename=None, s
     ax.set_title(title, fontsize=14)
     ax.grid(True, linestyle='--', alpha=0.7)
     
-    # Achsen anpassen
-    if diagram_type == "pv":
-        ax.set_xscale('log')  # Logarithmische x-Achse für p-v-Diagramm
-        ax.set_yscale('log')  # Logarithmische y-Achse für p-v-Diagramm
-    
     # Legende
     if joule_calc.regeneration:
         ax.plot([], [], 'k-', label='Hauptprozess')
@@ -164,9 +151,7 @@ def plot_process(joule_calc, diagram_type="Ts", save_fig=False, filename=None, s
         ax.plot([], [], 'r--', label='Wärmeübertragung')
         ax.legend()
     
-    plt.tight_layout()
-    
     if save_fig and filename:
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        fig.savefig(filename, dpi=300, bbox_inches='tight')
     
     return fig, ax
\ No newline at end of file
@@ -3,12 +3,38 @@ Formatting functions for displaying JOULE process calculation results.
 Produces tables and structured output of calculation steps.
 """
 
+import functools
+import io
+import os
+import unicodedata
+
+import numpy as np
 import pandas as pd
 from IPython.display import display, HTML, Markdown
 from utils.converters import kelvin_to_celsius, pascal_to_bar
 from models.gas_properties import GAS_PROPERTIES, get_material_properties
 
 
+def _display_rounded(df, decimals):
+    """
+    Zeigt einen DataFrame mit fester Anzahl Nachkommastellen an
+    
+    Die Formatierung erfolgt erst beim Rendern über den pandas-Styler, ohne eine
+    gerundete Kopie der Daten anzulegen. Ohne jinja2 (vom Styler benötigt) wird
+    auf DataFrame.round zurückgegriffen.
+    
+    Parameter:
+    df : pandas.DataFrame
+        Anzuzeigende Tabelle
+    decimals : int
+        Anzahl der Nachkommastellen
+    """
+    try:
+        display(df.style.format(precision=decimals))
+    except (ImportError, AttributeError):  # je nach pandas-Version
+        display(df.round(decimals))
+
+
 def print_results_table(joule_calc):
     """
     Gibt eine übersichtliche Tabelle mit den Zustandsgrößen aus
@@ -17,35 +43,24 @@ def print_results_table(joule_calc):
     joule_calc : JouleProcessCalculator
         Instanz des JouleProcessCalculator
     """
-    states_df = pd.DataFrame()
-    
-    # Benutzerdefinierte Sortierfunktion für gemischte Schlüssel
-    def custom_sort_key(key):
-        if isinstance(key, int):
-            return key, ""  # Zahlen zuerst, kein Suffix
-        else:
-            # String-Schlüssel wie "2*" aufteilen
-            try:
-                num = int(key.rstrip("*s"))
-                suffix = key[len(str(num)):]
-                return num, suffix
-            except ValueError:
-                return float('inf'), key  # Fallback
-    
-    # Sortierte Schlüssel mit benutzerdefinierter Funktion
-    sorted_keys = sorted(joule_calc.states.keys(), key=custom_sort_key)
+    # Zustandsschlüssel in Prozessreihenfolge (vom Rechner zwischengespeichert)
+    sorted_keys = joule_calc.get_sorted_state_keys()
     
+    # Zeilen sammeln und die Tabelle einmalig erzeugen
+    rows = []
+    index_labels = []
     for i in sorted_keys:
         state = joule_calc.states[i]
-        state_series = pd.Series({
+        rows.append({
             'p [bar]': pascal_to_bar(state['p']),
             'T [K]': state['T'],
             'T [°C]': kelvin_to_celsius(state['T']),
             'v [m³/kg]': state['v'],
             'h [J/kg]': state['h'],
             's [J/(kg·K)]': state['s']
-        }, name=f"Zustand {i}")
-        states_df = pd.concat([states_df, state_series.to_frame().T])
+        })
+        index_labels.append(f"Zustand {i}")
+    states_df = pd.DataFrame(rows, index=index_labels)
     
     display(HTML("<h3>Zustandsgrößen</h3>"))
     display(states_df)
@@ -63,7 +78,7 @@ def print_results_table(joule_calc):
         }], index=['Wert'])
         
         display(HTML("<h3>Prozessgrößen</h3>"))
-        display(props_df.round(4))
+        _display_rounded(props_df, 4)
         
         # Leistungen, wenn Massestrom gesetzt
         if joule_calc.mass_flow is not None and all(k in props for k in ['P_comp', 'P_turb', 'P_kp', 'Q_in', 'Q_out']):
@@ -77,41 +92,41 @@ def print_results_table(joule_calc):
             }], index=['Wert'])
             
             display(HTML("<h3>Leistungen</h3>"))
-            display(power_df.round(2))
+            _display_rounded(power_df, 2)
     except Exception as e:
         print(f"Fehler bei der Berechnung der Prozessgrößen: {e}")
 
 
-def material_properties_table(joule_calc, temperatures=None):
+@functools.lru_cache(maxsize=32)
+def _material_properties_frame(gas, use_const_cp, temperatures):
     """
-    Gibt eine Tabelle mit den Stoffwerten des gewählten Gases bei verschiedenen Temperaturen aus
+    Erstellt die Stoffwerttabelle (zwischengespeichert je Gas, cp-Modell und Temperaturen)
     
     Parameter:
-    joule_calc : JouleProcessCalculator
-        Instanz des JouleProcessCalculator
-    temperatures : list
-        Liste von Temperaturen in K, bei denen die Stoffwerte berechnet werden sollen
+    gas : str
+        Name des Gases
+    use_const_cp : bool
+        Wenn True, werden konstante Wärmekapazitäten verwendet
+    temperatures : tuple
+        Temperaturen in K, bei denen die Stoffwerte berechnet werden
+        
+    Returns:
+    pandas.DataFrame:
+        Gerundete Stoffwerte je Temperatur
     """
-    if temperatures is None:
-        # Wenn keine Temperaturen angegeben, benutze die Temperaturen aus den berechneten Zuständen
-        temperatures = []
-        for state in joule_calc.states.values():
-            temperatures.append(state["T"])
-        temperatures = sorted(list(set(temperatures)))  # Duplikate entfernen und sortieren
-    
-    props_df = pd.DataFrame()
-    
+    # Zeilen sammeln und die Tabelle einmalig erzeugen
+    rows = []
     for T in temperatures:
-        props = get_material_properties(joule_calc.gas, T, joule_calc.use_const_cp)
-        props_series = pd.Series({
+        props = get_material_properties(gas, T, use_const_cp)
+        rows.append({
             'T [K]': T,
             'T [°C]': kelvin_to_celsius(T),
             'cp [J/(kg·K)]': props["cp"],
             'cv [J/(kg·K)]': props["cv"],
             'κ [-]': props["kappa"],
             'R [J/(kg·K)]': props["R"]
-        }, name=f"{T:.2f} K")
-        props_df = pd.concat([props_df, props_series.to_frame().T])
+        })
+    props_df = pd.DataFrame(rows, index=[f"{T:.2f} K" for T in temperatures])
     
     # Formatieren der Tabelle
     props_df = props_df.round({
@@ -123,6 +138,28 @@ def material_properties_table(joule_calc, temperatures=None):
         'R [J/(kg·K)]': 2
     })
     
+    return props_df
+
+
+def material_properties_table(joule_calc, temperatures=None):
+    """
+    Gibt eine Tabelle mit den Stoffwerten des gewählten Gases bei verschiedenen Temperaturen aus
+    
+    Parameter:
+    joule_calc : JouleProcessCalculator
+        Instanz des JouleProcessCalculator
+    temperatures : list
+        Liste von Temperaturen in K, bei denen die Stoffwerte berechnet werden sollen
+    """
+    if temperatures is None:
+        # Wenn keine Temperaturen angegeben, benutze die Temperaturen aus den berechneten Zuständen
+        temperatures = []
+        for state in joule_calc.states.values():
+            temperatures.append(state["T"])
+        temperatures = sorted(list(set(temperatures)))  # Duplikate entfernen und sortieren
+    
+    props_df = _material_properties_frame(joule_calc.gas, joule_calc.use_const_cp, tuple(temperatures))
+    
     display(HTML(f"<h3>Stoffwerte für {GAS_PROPERTIES[joule_calc.gas]['name']}</h3>"))
     display(props_df)
 
@@ -190,11 +227,16 @@ def print_calculation_steps(joule_calc, category=None, format_type="html", outpu
             all_output.append("=================================\n")
         
         # Zustandsgrößen übersichtlich zusammenfassen
-        states_summary = create_states_summary(joule_calc, format_type)
+        sorted_keys = joule_calc.get_sorted_state_keys()
+        states_summary = create_states_summary(joule_calc, format_type, sorted_keys)
         all_output.append(states_summary)
         
-        # Prozessgrößen übersichtlich zusammenfassen
-        process_summary = create_process_summary(joule_calc, format_type)
+        # Prozessgrößen einmalig berechnen und übersichtlich zusammenfassen
+        try:
+            props = joule_calc.calculate_process_properties()
+        except Exception:
+            props = None  # Der Fehler wird von create_process_summary gemeldet
+        process_summary = create_process_summary(joule_calc, format_type, props)
         all_output.append(process_summary)
         
         # Detaillierte Berechnungsschritte in geordneter Reihenfolge
@@ -214,38 +256,150 @@ def print_calculation_steps(joule_calc, category=None, format_type="html", outpu
                     all_output.append(text_output)
         
         # Combine all outputs
+        # (in eine Datei werden die Teile direkt geschrieben, ohne sie vorher zusammenzufügen)
         if format_type == "html":
-            combined_output = "<div style='max-width: 800px; margin: 0 auto;'>"
-            combined_output += "".join(all_output)
-            combined_output += "</div>"
+            container_open = "<div style='max-width: 800px; margin: 0 auto;'>"
             
             if output_file:
                 with open(output_file, 'w', encoding='utf-8') as f:
                     f.write(f"<!DOCTYPE html><html><head><title>JOULE-Prozess</title>"
-                           f"<style>{_get_html_css()}</style></head><body>{combined_output}</body></html>")
+                            f"<style>{_HTML_CSS}</style></head><body>{container_open}")
+                    f.writelines(all_output)
+                    f.write("</div></body></html>")
             else:
-                display(HTML(combined_output))
+                display(HTML(container_open + "".join(all_output) + "</div>"))
+        
+        elif output_file:  # markdown oder text
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(all_output[0])
+                for part in all_output[1:]:
+                    f.write("\n\n")
+                    f.write(part)
         
         elif format_type == "markdown":
-            combined_output = "\n\n".join(all_output)
-            
-            if output_file:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(combined_output)
-            else:
-                display(Markdown(combined_output))
+            display(Markdown("\n\n".join(all_output)))
         
         else:  # text
-            combined_output = "\n\n".join(all_output)
-            
-            if output_file:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(combined_output)
-            else:
-                print(combined_output)
+            print("\n\n".join(all_output))
+
+
+# Spalten der Zustandsübersicht: (Überschrift, Wertfunktion, Format, Breite im Textformat)
+# Die Wertfunktionen erhalten ein Dictionary mit je einem Array pro Zustandsgröße
+_STATE_COLUMNS = [
+    ('p [bar]', lambda cols: pascal_to_bar(cols['p']), '.4f', 10),
+    ('T [K]', lambda cols: cols['T'], '.2f', 10),
+    ('T [°C]', lambda cols: kelvin_to_celsius(cols['T']), '.2f', 10),
+    ('v [m³/kg]', lambda cols: cols['v'], '.6f', 12),
+    ('h [J/kg]', lambda cols: cols['h'], '.2f', 12),
+    ('s [J/(kg·K)]', lambda cols: cols['s'], '.4f', 15),
+]
+
+# Spalten der Zustandstabelle: (Überschrift, Breite im Textformat)
+_STATE_TABLE_COLUMNS = (('Zustand', 8),) + tuple((header, width) for header, _, _, width in _STATE_COLUMNS)
+
+# Zeilen der Prozessübersicht: (Bezeichnung, Schlüssel, Format, Einheit)
+_PROCESS_ROWS = [
+    ('Druckverhältnis π', 'pi', '.4f', '-'),
+    ('Temperaturverhältnis τ', 'tau', '.4f', '-'),
+    ('Verdichterarbeit w_c', 'w_comp', '.2f', 'J/kg'),
+    ('Turbinenarbeit w_t', 'w_turb', '.2f', 'J/kg'),
+    ('Kreisprozessarbeit w_KP', 'w_kp', '.2f', 'J/kg'),
+    ('Wärmezufuhr q_zu', 'q_in', '.2f', 'J/kg'),
+    ('Wärmeabfuhr q_ab', 'q_out', '.2f', 'J/kg'),
+    ('Thermischer Wirkungsgrad η_th', 'eta_th', '.4f', '-'),
+]
+
+# Leistungszeilen der Prozessübersicht (Werte in W, Ausgabe in kW)
+_POWER_ROWS = [
+    ('Verdichterleistung P_c', 'P_comp'),
+    ('Turbinenleistung P_t', 'P_turb'),
+    ('Nettoleistung P_KP', 'P_kp'),
+    ('Wärmeleistung zu Q_zu', 'Q_in'),
+    ('Wärmeleistung ab Q_ab', 'Q_out'),
+]
+
+# Spalten der Prozessübersicht: (Überschrift, Breite im Textformat)
+_PROCESS_COLUMNS = (('Größe', 30), ('Wert', 10), ('Einheit', 10))
+
+
+@functools.lru_cache(maxsize=None)
+def _table_templates(format_type, columns):
+    """
+    Erzeugt die Format-Vorlagen einer Tabelle (einmalig je Format und Spaltenlayout)
+    
+    Parameter:
+    format_type : str
+        Format für die Ausgabe ('html', 'markdown', 'text')
+    columns : tuple
+        Spalten als (Überschrift, Breite im Textformat)
+        
+    Returns:
+    tuple:
+        (Kopf, Zeile, Zwischenüberschrift, Fuß); der Kopf wird mit title und underline,
+        die Zeile mit den Zellen und die Zwischenüberschrift mit heading gefüllt
+    """
+    # Geschweifte Klammern in Überschriften dürfen nicht als Platzhalter gelten
+    headers = [header.replace("{", "{{").replace("}", "}}") for header, _ in columns]
+    widths = [width for _, width in columns]
+    
+    if format_type == "html":
+        head = ("<h2>{title}</h2>"
+                "<table border='1' style='border-collapse: collapse; width: 100%;'>"
+                "<tr>" + "".join(f"<th>{header}</th>" for header in headers) + "</tr>")
+        row = "<tr>" + "<td>{}</td>" * len(columns) + "</tr>"
+        section = f"<tr><td colspan='{len(columns)}'><b>{{heading}}</b></td></tr>"
+        footer = "</table>"
+    elif format_type == "markdown":
+        head = ("## {title}\n\n"
+                "| " + " | ".join(headers) + " |\n"
+                "|" + "|".join("-" * (len(header) + 2) for header, _ in columns) + "|\n")
+        row = "| " + " | ".join(["{}"] * len(columns)) + " |\n"
+        section = "\n**{heading}**\n\n"
+        footer = ""
+    else:  # text
+        rule = "-" * (sum(widths) + len(widths) - 1) + "\n"
+        row = " ".join(f"{{:<{width}}}" for width in widths) + "\n"
+        header_line = row.format(*(header for header, _ in columns))
+        head = "{title}\n{underline}\n\n" + header_line.replace("{", "{{").replace("}", "}}") + rule
+        section = "\n{heading}\n" + rule
+        footer = ""
+    
+    return head, row, section, footer
 
 
-def create_states_summary(joule_calc, format_type="html"):
+def _render_table(title, columns, rows, format_type, sections=()):
+    """
+    Gibt eine Tabelle aus bereits formatierten Zellen als HTML, Markdown oder Text aus
+    
+    Parameter:
+    title : str
+        Überschrift der Tabelle
+    columns : list
+        Spalten als (Überschrift, Breite im Textformat)
+    rows : list
+        Zeilen als Listen von Zell-Strings
+    format_type : str
+        Format für die Ausgabe ('html', 'markdown', 'text')
+    sections : list
+        Optional: Weitere Abschnitte als (Zwischenüberschrift, Zeilen)
+        
+    Returns:
+    str:
+        Formatierte Tabelle
+    """
+    head_tmpl, row_tmpl, section_tmpl, footer = _table_templates(format_type, tuple(columns))
+    
+    parts = [head_tmpl.format(title=title, underline="=" * len(title))]
+    parts.extend(row_tmpl.format(*cells) for cells in rows)
+    for heading, section_rows in sections:
+        parts.append(section_tmpl.format(heading=heading))
+        parts.extend(row_tmpl.format(*cells) for cells in section_rows)
+    parts.append(footer)
+    
+    return "".join(parts)
+
+
+def create_states_summary(joule_calc, format_type="html", sorted_keys=None):
     """
     Erstellt eine übersichtliche Zusammenfassung der Zustandsgrößen
     
@@ -254,68 +408,28 @@ def create_states_summary(joule_calc, format_type="html"):
         Instanz des JouleProcessCalculator
     format_type : str
         Format für die Ausgabe ('html', 'markdown', 'text')
+    sorted_keys : list
+        Optional: Bereits sortierte Zustandsschlüssel, sonst vom Rechner abgefragt
         
     Returns:
     str:
         Formatierte Zusammenfassung der Zustandsgrößen
     """
-    # Hilfsfunktion für benutzerdefinierte Sortierung
-    def custom_sort_key(key):
-        if isinstance(key, int):
-            return key, ""
-        else:
-            try:
-                num = int(key.rstrip("*s"))
-                suffix = key[len(str(num)):]
-                return num, suffix
-            except (ValueError, AttributeError):
-                return float('inf'), key
-    
     # Sortierte Schlüssel
-    sorted_keys = sorted(joule_calc.states.keys(), key=custom_sort_key)
+    if sorted_keys is None:
+        sorted_keys = joule_calc.get_sorted_state_keys()
     
-    if format_type == "html":
-        output = "<h2>Zustandsgrößen Übersicht</h2>"
-        output += "<table border='1' style='border-collapse: collapse; width: 100%;'>"
-        output += "<tr><th>Zustand</th><th>p [bar]</th><th>T [K]</th><th>T [°C]</th><th>v [m³/kg]</th><th>h [J/kg]</th><th>s [J/(kg·K)]</th></tr>"
-        
-        for i in sorted_keys:
-            state = joule_calc.states[i]
-            output += f"<tr><td>{i}</td>"
-            output += f"<td>{state['p']/1e5:.4f}</td>"
-            output += f"<td>{state['T']:.2f}</td>"
-            output += f"<td>{state['T']-273.15:.2f}</td>"
-            output += f"<td>{state['v']:.6f}</td>"
-            output += f"<td>{state['h']:.2f}</td>"
-            output += f"<td>{state['s']:.4f}</td></tr>"
-        
-        output += "</table>"
-        
-    elif format_type == "markdown":
-        output = "## Zustandsgrößen Übersicht\n\n"
-        output += "| Zustand | p [bar] | T [K] | T [°C] | v [m³/kg] | h [J/kg] | s [J/(kg·K)] |\n"
-        output += "|---------|---------|-------|--------|-----------|----------|--------------|\n"
-        
-        for i in sorted_keys:
-            state = joule_calc.states[i]
-            output += f"| {i} | {state['p']/1e5:.4f} | {state['T']:.2f} | {state['T']-273.15:.2f} | "
-            output += f"{state['v']:.6f} | {state['h']:.2f} | {state['s']:.4f} |\n"
-        
-    else:  # text
-        output = "Zustandsgrößen Übersicht\n"
-        output += "======================\n\n"
-        output += f"{'Zustand':<8} {'p [bar]':<10} {'T [K]':<10} {'T [°C]':<10} {'v [m³/kg]':<12} {'h [J/kg]':<12} {'s [J/(kg·K)]':<15}\n"
-        output += "-" * 80 + "\n"
-        
-        for i in sorted_keys:
-            state = joule_calc.states[i]
-            output += f"{i:<8} {state['p']/1e5:<10.4f} {state['T']:<10.2f} {state['T']-273.15:<10.2f} "
-            output += f"{state['v']:<12.6f} {state['h']:<12.2f} {state['s']:<15.4f}\n"
+    # Zustandsgrößen einmalig als Arrays extrahieren und spaltenweise formatieren
+    states = [joule_calc.states[i] for i in sorted_keys]
+    arrays = {key: np.fromiter((state[key] for state in states), dtype=np.float64, count=len(states))
+              for key in ('p', 'T', 'v', 'h', 's')}
+    formatted = [np.char.mod(f"%{fmt}", value(arrays)).tolist() for _, value, fmt, _ in _STATE_COLUMNS]
+    rows = [[str(i), *cells] for i, cells in zip(sorted_keys, zip(*formatted))]
     
-    return output
+    return _render_table("Zustandsgrößen Übersicht", _STATE_TABLE_COLUMNS, rows, format_type)
 
 
-def create_process_summary(joule_calc, format_type="html"):
+def create_process_summary(joule_calc, format_type="html", props=None):
     """
     Erstellt eine übersichtliche Zusammenfassung der Prozessgrößen
     
@@ -324,99 +438,34 @@ def create_process_summary(joule_calc, format_type="html"):
         Instanz des JouleProcessCalculator
     format_type : str
         Format für die Ausgabe ('html', 'markdown', 'text')
+    props : dict
+        Optional: Bereits berechnete Prozessgrößen, sonst neu berechnet
         
     Returns:
     str:
         Formatierte Zusammenfassung der Prozessgrößen
     """
     try:
-        props = joule_calc.calculate_process_properties()
+        if props is None:
+            props = joule_calc.calculate_process_properties()
         
-        if format_type == "html":
-            output = "<h2>Prozessgrößen Übersicht</h2>"
-            output += "<table border='1' style='border-collapse: collapse; width: 100%;'>"
-            output += "<tr><th>Größe</th><th>Wert</th><th>Einheit</th></tr>"
-            
-            # Wichtige Prozessgrößen für Klausuren
-            output += f"<tr><td>Druckverhältnis π</td><td>{props.get('pi', '-'):.4f}</td><td>-</td></tr>"
-            output += f"<tr><td>Temperaturverhältnis τ</td><td>{props.get('tau', '-'):.4f}</td><td>-</td></tr>"
-            output += f"<tr><td>Verdichterarbeit w_c</td><td>{props.get('w_comp', '-'):.2f}</td><td>J/kg</td></tr>"
-            output += f"<tr><td>Turbinenarbeit w_t</td><td>{props.get('w_turb', '-'):.2f}</td><td>J/kg</td></tr>"
-            output += f"<tr><td>Kreisprozessarbeit w_KP</td><td>{props.get('w_kp', '-'):.2f}</td><td>J/kg</td></tr>"
-            output += f"<tr><td>Wärmezufuhr q_zu</td><td>{props.get('q_in', '-'):.2f}</td><td>J/kg</td></tr>"
-            output += f"<tr><td>Wärmeabfuhr q_ab</td><td>{props.get('q_out', '-'):.2f}</td><td>J/kg</td></tr>"
-            output += f"<tr><td>Thermischer Wirkungsgrad η_th</td><td>{props.get('eta_th', '-'):.4f}</td><td>-</td></tr>"
-            
-            # Leistungen anzeigen, wenn Massestrom gesetzt
-            if joule_calc.mass_flow is not None and all(k in props for k in ['P_comp', 'P_turb', 'P_kp']):
-                output += f"<tr><td colspan='3'><b>Leistungen (Massestrom: {joule_calc.mass_flow:.4f} kg/s)</b></td></tr>"
-                output += f"<tr><td>Verdichterleistung P_c</td><td>{props.get('P_comp', '-')/1000:.2f}</td><td>kW</td></tr>"
-                output += f"<tr><td>Turbinenleistung P_t</td><td>{props.get('P_turb', '-')/1000:.2f}</td><td>kW</td></tr>"
-                output += f"<tr><td>Nettoleistung P_KP</td><td>{props.get('P_kp', '-')/1000:.2f}</td><td>kW</td></tr>"
-                output += f"<tr><td>Wärmeleistung zu Q_zu</td><td>{props.get('Q_in', '-')/1000:.2f}</td><td>kW</td></tr>"
-                output += f"<tr><td>Wärmeleistung ab Q_ab</td><td>{props.get('Q_out', '-')/1000:.2f}</td><td>kW</td></tr>"
-            
-            output += "</table>"
-            
-        elif format_type == "markdown":
-            output = "## Prozessgrößen Übersicht\n\n"
-            output += "| Größe | Wert | Einheit |\n"
-            output += "|-------|------|--------|\n"
-            
-            # Wichtige Prozessgrößen für Klausuren
-            output += f"| Druckverhältnis π | {props.get('pi', '-'):.4f} | - |\n"
-            output += f"| Temperaturverhältnis τ | {props.get('tau', '-'):.4f} | - |\n"
-            output += f"| Verdichterarbeit w_c | {props.get('w_comp', '-'):.2f} | J/kg |\n"
-            output += f"| Turbinenarbeit w_t | {props.get('w_turb', '-'):.2f} | J/kg |\n"
-            output += f"| Kreisprozessarbeit w_KP | {props.get('w_kp', '-'):.2f} | J/kg |\n"
-            output += f"| Wärmezufuhr q_zu | {props.get('q_in', '-'):.2f} | J/kg |\n"
-            output += f"| Wärmeabfuhr q_ab | {props.get('q_out', '-'):.2f} | J/kg |\n"
-            output += f"| Thermischer Wirkungsgrad η_th | {props.get('eta_th', '-'):.4f} | - |\n"
-            
-            # Leistungen anzeigen, wenn Massestrom gesetzt
-            if joule_calc.mass_flow is not None and all(k in props for k in ['P_comp', 'P_turb', 'P_kp']):
-                output += f"\n**Leistungen (Massestrom: {joule_calc.mass_flow:.4f} kg/s)**\n\n"
-                output += f"| Verdichterleistung P_c | {props.get('P_comp', '-')/1000:.2f} | kW |\n"
-                output += f"| Turbinenleistung P_t | {props.get('P_turb', '-')/1000:.2f} | kW |\n"
-                output += f"| Nettoleistung P_KP | {props.get('P_kp', '-')/1000:.2f} | kW |\n"
-                output += f"| Wärmeleistung zu Q_zu | {props.get('Q_in', '-')/1000:.2f} | kW |\n"
-                output += f"| Wärmeleistung ab Q_ab | {props.get('Q_out', '-')/1000:.2f} | kW |\n"
-            
-        else:  # text
-            output = "Prozessgrößen Übersicht\n"
-            output += "======================\n\n"
-            output += f"{'Größe':<30} {'Wert':<10} {'Einheit':<10}\n"
-            output += "-" * 50 + "\n"
-            
-            # Wichtige Prozessgrößen für Klausuren
-            output += f"{'Druckverhältnis π':<30} {props.get('pi', '-'):<10.4f} {'-':<10}\n"
-            output += f"{'Temperaturverhältnis τ':<30} {props.get('tau', '-'):<10.4f} {'-':<10}\n"
-            output += f"{'Verdichterarbeit w_c':<30} {props.get('w_comp', '-'):<10.2f} {'J/kg':<10}\n"
-            output += f"{'Turbinenarbeit w_t':<30} {props.get('w_turb', '-'):<10.2f} {'J/kg':<10}\n"
-            output += f"{'Kreisprozessarbeit w_KP':<30} {props.get('w_kp', '-'):<10.2f} {'J/kg':<10}\n"
-            output += f"{'Wärmezufuhr q_zu':<30} {props.get('q_in', '-'):<10.2f} {'J/kg':<10}\n"
-            output += f"{'Wärmeabfuhr q_ab':<30} {props.get('q_out', '-'):<10.2f} {'J/kg':<10}\n"
-            output += f"{'Thermischer Wirkungsgrad η_th':<30} {props.get('eta_th', '-'):<10.4f} {'-':<10}\n"
-            
-            # Leistungen anzeigen, wenn Massestrom gesetzt
-            if joule_calc.mass_flow is not None and all(k in props for k in ['P_comp', 'P_turb', 'P_kp']):
-                output += f"\nLeistungen (Massestrom: {joule_calc.mass_flow:.4f} kg/s)\n"
-                output += "-" * 50 + "\n"
-                output += f"{'Verdichterleistung P_c':<30} {props.get('P_comp', '-')/1000:<10.2f} {'kW':<10}\n"
-                output += f"{'Turbinenleistung P_t':<30} {props.get('P_turb', '-')/1000:<10.2f} {'kW':<10}\n"
-                output += f"{'Nettoleistung P_KP':<30} {props.get('P_kp', '-')/1000:<10.2f} {'kW':<10}\n"
-                output += f"{'Wärmeleistung zu Q_zu':<30} {props.get('Q_in', '-')/1000:<10.2f} {'kW':<10}\n"
-                output += f"{'Wärmeleistung ab Q_ab':<30} {props.get('Q_out', '-')/1000:<10.2f} {'kW':<10}\n"
-        
-        return output
+        # Wichtige Prozessgrößen für Klausuren
+        rows = [[label, format(props[key], fmt), unit] for label, key, fmt, unit in _PROCESS_ROWS]
+        
+        # Leistungen anzeigen, wenn Massestrom gesetzt
+        sections = []
+        if joule_calc.mass_flow is not None and all(k in props for k in ['P_comp', 'P_turb', 'P_kp']):
+            power_rows = [[label, f"{props[key]/1000:.2f}", 'kW'] for label, key in _POWER_ROWS]
+            sections.append((f"Leistungen (Massestrom: {joule_calc.mass_flow:.4f} kg/s)", power_rows))
+        
+        return _render_table("Prozessgrößen Übersicht", _PROCESS_COLUMNS, rows, format_type, sections)
     
     except Exception as e:
         return f"Fehler bei der Berechnung der Prozessgrößen: {e}"
 
 
-def _get_html_css():
-    """Return CSS styles for HTML output"""
-    return """
+# CSS styles for HTML output
+_HTML_CSS = """
     body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
     h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
     h2 { color: #3498db; border-bottom: 1px solid #ddd; padding-bottom: 5px; margin-top: 30px; }
@@ -437,34 +486,33 @@ def _print_steps_html(title, steps, output_file=None):
     if output_file:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(f"<!DOCTYPE html><html><head><title>{title}</title>"
-                   f"<style>{_get_html_css()}</style></head><body>{html_output}</body></html>")
+                   f"<style>{_HTML_CSS}</style></head><body>{html_output}</body></html>")
     else:
         display(HTML(html_output))
 
 
 def _generate_steps_html(title, steps):
     """Generate HTML output for steps"""
-    html_output = f"<div class='category'><h2>{title}</h2>"
+    parts = [f"<div class='category'><h2>{title}</h2>"]
     
     for i, step in enumerate(steps):
-        html_output += f"<div class='step' id='step-{i+1}'>"
-        html_output += f"<h3>{step['title']}</h3>"
+        parts.append(f"<div class='step' id='step-{i+1}'><h3>{step['title']}</h3>")
         
         if step['formula']:
-            html_output += f"<p class='formula'><strong>Formel:</strong> {step['formula']}</p>"
+            parts.append(f"<p class='formula'><strong>Formel:</strong> {step['formula']}</p>")
         
         if step['calculation']:
-            html_output += f"<p class='calculation'><strong>Berechnung:</strong> {step['calculation']}</p>"
+            parts.append(f"<p class='calculation'><strong>Berechnung:</strong> {step['calculation']}</p>")
         
         if step['result'] is not None:
             result_str = f"{step['result']:.6g}" if isinstance(step['result'], float) else str(step['result'])
             unit_str = f" {step['unit']}" if step['unit'] else ""
-            html_output += f"<p class='result'><strong>Ergebnis:</strong> {result_str}{unit_str}</p>"
+            parts.append(f"<p class='result'><strong>Ergebnis:</strong> {result_str}{unit_str}</p>")
         
-        html_output += "</div>"
+        parts.append("</div>")
     
-    html_output += "</div>"
-    return html_output
+    parts.append("</div>")
+    return "".join(parts)
 
 
 def _print_steps_markdown(title, steps, output_file=None):
@@ -480,25 +528,25 @@ def _print_steps_markdown(title, steps, output_file=None):
 
 def _generate_steps_markdown(title, steps):
     """Generate Markdown output for steps"""
-    md_output = f"## {title}\n\n"
+    parts = [f"## {title}\n\n"]
     
     for i, step in enumerate(steps):
-        md_output += f"### {step['title']}\n\n"
+        parts.append(f"### {step['title']}\n\n")
         
         if step['formula']:
-            md_output += f"**Formel:** {step['formula']}\n\n"
+            parts.append(f"**Formel:** {step['formula']}\n\n")
         
         if step['calculation']:
-            md_output += f"**Berechnung:** {step['calculation']}\n\n"
+            parts.append(f"**Berechnung:** {step['calculation']}\n\n")
         
         if step['result'] is not None:
             result_str = f"{step['result']:.6g}" if isinstance(step['result'], float) else str(step['result'])
             unit_str = f" {step['unit']}" if step['unit'] else ""
-            md_output += f"**Ergebnis:** {result_str}{unit_str}\n\n"
+            parts.append(f"**Ergebnis:** {result_str}{unit_str}\n\n")
         
-        md_output += "---\n\n"
+        parts.append("---\n\n")
     
-    return md_output
+    return "".join(parts)
 
 
 def _print_steps_text(title, steps, output_file=None):
@@ -514,27 +562,26 @@ def _print_steps_text(title, steps, output_file=None):
 
 def _generate_steps_text(title, steps):
     """Generate plain text output for steps"""
-    text_output = f"{title}\n"
-    text_output += "=" * len(title) + "\n\n"
+    parts = [f"{title}\n", "=" * len(title) + "\n\n"]
     
     for i, step in enumerate(steps):
-        text_output += f"{step['title']}\n"
-        text_output += "-" * len(step['title']) + "\n"
+        parts.append(f"{step['title']}\n")
+        parts.append("-" * len(step['title']) + "\n")
         
         if step['formula']:
-            text_output += f"Formel: {step['formula']}\n"
+            parts.append(f"Formel: {step['formula']}\n")
         
         if step['calculation']:
-            text_output += f"Berechnung: {step['calculation']}\n"
+            parts.append(f"Berechnung: {step['calculation']}\n")
         
         if step['result'] is not None:
             result_str = f"{step['result']:.6g}" if isinstance(step['result'], float) else str(step['result'])
             unit_str = f" {step['unit']}" if step['unit'] else ""
-            text_output += f"Ergebnis: {result_str}{unit_str}\n"
+            parts.append(f"Ergebnis: {result_str}{unit_str}\n")
         
-        text_output += "\n"
+        parts.append("\n")
     
-    return text_output
+    return "".join(parts)
 
 
 def print_calculation_summary(joule_calc, output_file=None):
@@ -547,28 +594,23 @@ def print_calculation_summary(joule_calc, output_file=None):
     output_file : str
         Optional: Pfad zur Ausgabedatei
     """
-    # Create a summary dataframe
-    summary_data = []
-    
-    for i, step in enumerate(joule_calc.steps):
-        category = ""
-        for cat, steps in joule_calc.step_categories.items():
-            if step in steps:
-                category = cat
-                break
-        
-        result_str = f"{step['result']:.6g}" if isinstance(step['result'], float) and step['result'] is not None else ""
-        unit_str = step['unit'] if step['unit'] else ""
-        
-        summary_data.append({
-            "Nr.": i+1,
-            "Kategorie": category,
-            "Schritt": step['title'],
-            "Ergebnis": result_str,
-            "Einheit": unit_str
-        })
-    
-    summary_df = pd.DataFrame(summary_data)
+    # Create a summary dataframe (spaltenweise als Listen)
+    steps = joule_calc.steps
+    
+    # Kategorie je Schritt einmalig zuordnen (über die Objekt-ID, da Schritte dicts sind)
+    step_to_cat = {id(step): cat for cat, cat_steps in joule_calc.step_categories.items() for step in cat_steps}
+    
+    # Ergebnis- und Einheitentexte vorab formatieren
+    results = [f"{step['result']:.6g}" if isinstance(step['result'], float) else "" for step in steps]
+    units = [step['unit'] or "" for step in steps]
+    
+    summary_df = pd.DataFrame({
+        "Nr.": range(1, len(steps) + 1),
+        "Kategorie": [step_to_cat.get(id(step), "") for step in steps],
+        "Schritt": [step['title'] for step in steps],
+        "Ergebnis": results,
+        "Einheit": units
+    })
     
     if output_file:
         # Export to Excel or CSV
@@ -583,7 +625,198 @@ def print_calculation_summary(joule_calc, output_file=None):
         display(summary_df)
 
 
-def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
+# Ersetzungstabelle für den PDF-Export: Unicode-Zeichen -> Latin-1-sichere Alternativen
+# (einmalig als str.translate-Tabelle erzeugt, ein Durchlauf pro Text)
+_PDF_TRANSLATION = str.maketrans({
+    # Griechische Buchstaben (kleine)
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon',
+    'ζ': 'zeta', 'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa',
+    'λ': 'lambda', 'μ': 'mu', 'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron',
+    'π': 'pi', 'ρ': 'rho', 'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon',
+    'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+    
+    # Griechische Buchstaben (große)
+    'Α': 'Alpha', 'Β': 'Beta', 'Γ': 'Gamma', 'Δ': 'Delta', 'Ε': 'Epsilon',
+    'Ζ': 'Zeta', 'Η': 'Eta', 'Θ': 'Theta', 'Ι': 'Iota', 'Κ': 'Kappa',
+    'Λ': 'Lambda', 'Μ': 'Mu', 'Ν': 'Nu', 'Ξ': 'Xi', 'Ο': 'Omicron',
+    'Π': 'Pi', 'Ρ': 'Rho', 'Σ': 'Sigma', 'Τ': 'Tau', 'Υ': 'Upsilon',
+    'Φ': 'Phi', 'Χ': 'Chi', 'Ψ': 'Psi', 'Ω': 'Omega',
+    
+    # Tiefgestellte Zahlen
+    '₀': '_0', '₁': '_1', '₂': '_2', '₃': '_3', '₄': '_4',
+    '₅': '_5', '₆': '_6', '₇': '_7', '₈': '_8', '₉': '_9',
+    
+    # Hochgestellte Zahlen
+    '⁰': '^0', '¹': '^1', '²': '^2', '³': '^3', '⁴': '^4',
+    '⁵': '^5', '⁶': '^6', '⁷': '^7', '⁸': '^8', '⁹': '^9',
+    
+    # Thermodynamische Symbole
+    '°': 'deg', '·': '*', '→': '->', '←': '<-', '−': '-',
+    '×': 'x', '≈': '~=', '≠': '!=', '≤': '<=', '≥': '>=',
+    '±': '+/-', '∂': 'd', '∫': 'int', '√': 'sqrt', '∞': 'inf',
+    
+    # Deutsche Umlaute
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss'
+})
+
+
+@functools.lru_cache(maxsize=1)
+def _unicode_font_files():
+    """
+    Sucht die DejaVu-Sans-Schriftdateien für den PDF-Export mit Unicode-Text
+    
+    Verwendet werden die TrueType-Dateien, die matplotlib mitliefert, so dass
+    keine eigene Schriftdatei im Projekt abgelegt werden muss.
+    
+    Returns:
+    dict:
+        Dateipfade je Schriftschnitt ('', 'B', 'I', 'BI') oder None, wenn die
+        Schriftdateien nicht gefunden werden
+    """
+    try:
+        import matplotlib
+    except ImportError:
+        return None
+    
+    font_dir = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf')
+    files = {
+        '': 'DejaVuSans.ttf',
+        'B': 'DejaVuSans-Bold.ttf',
+        'I': 'DejaVuSans-Oblique.ttf',
+        'BI': 'DejaVuSans-BoldOblique.ttf',
+    }
+    paths = {style: os.path.join(font_dir, name) for style, name in files.items()}
+    if not all(os.path.isfile(path) for path in paths.values()):
+        return None
+    return paths
+
+
+@functools.lru_cache(maxsize=8192)
+def _sanitize_pdf_text(text, unicode_font):
+    """
+    Bereitet einen Text für die Ausgabe im PDF auf
+    
+    Wiederkehrende Texte (Überschriften, Einheiten, Formeln) werden nur einmal
+    umgewandelt und danach aus dem Zwischenspeicher geliefert.
+    
+    Parameter:
+    text : str
+        Auszugebender Text
+    unicode_font : bool
+        True, wenn eine TrueType-Schrift mit Unicode-Unterstützung verwendet wird
+        
+    Returns:
+    str:
+        Mit der Schrift darstellbarer Text
+    """
+    # Die TrueType-Schrift stellt Unicode direkt dar, vereinheitlicht wird
+    # nur die Zeichenkomposition
+    if unicode_font:
+        return unicodedata.normalize('NFC', text)
+    
+    # Ersetze Zeichen durch sichere Alternativen
+    text = text.translate(_PDF_TRANSLATION)
+    
+    # Entferne alle verbleibenden nicht-Latin1-Zeichen (in einem Durchlauf des Encoders)
+    return text.encode('latin-1', 'ignore').decode('latin-1')
+
+
+def _state_display(state):
+    """
+    Gibt die formatierten Zustandsgrößen eines Zustands als mehrzeiligen Text zurück
+    
+    Der Text wird beim ersten Aufruf unter state['_display'] abgelegt. Der
+    JouleProcessCalculator legt bei jeder Neuberechnung ein neues Zustands-
+    Dictionary an, so dass der Zwischenspeicher dabei automatisch verfällt.
+    
+    Parameter:
+    state : dict
+        Zustandsgrößen eines Zustands (p, T, v, h, s)
+        
+    Returns:
+    str:
+        Zustandsgrößen, eine Größe pro Zeile
+    """
+    display = state.get('_display')
+    if display is None:
+        display = "\n".join([
+            f"p [bar]: {pascal_to_bar(state['p']):.6g}",
+            f"T [K]: {state['T']:.6g}",
+            f"T [°C]: {kelvin_to_celsius(state['T']):.6g}",
+            f"v [m³/kg]: {state['v']:.6g}",
+            f"h [J/kg]: {state['h']:.6g}",
+            f"s [J/(kg·K)]: {state['s']:.6g}"
+        ])
+        state['_display'] = display
+    return display
+
+
+def _expand_step(step):
+    """
+    Zerlegt einen Berechnungsschritt in die Textzeilen für den PDF-Export
+    
+    Parameter:
+    step : dict
+        Berechnungsschritt (title, formula, calculation, result, unit)
+        
+    Returns:
+    list:
+        Zeilen als (Schriftschnitt, Text, Umbruch)-Tupel; Zeilen mit Umbruch=True
+        werden mit multi_cell an der Seitenbreite umgebrochen
+    """
+    rows = [('B', step['title'], False)]
+    
+    formula = step['formula']
+    if formula:
+        rows.append(('I', f"Formel: {formula}", False))
+    
+    calculation = step['calculation']
+    if calculation:
+        # Lange Berechnungstexte bricht multi_cell an der Seitenbreite um
+        rows.append(('', f"Berechnung: {calculation}", True))
+    
+    result = step['result']
+    if result is not None:
+        result_str = f"{result:.6g}" if isinstance(result, float) else str(result)
+        unit_str = f" {step['unit']}" if step['unit'] else ""
+        rows.append(('B', f"Ergebnis: {result_str}{unit_str}", False))
+    
+    return rows
+
+
+def _render_diagram_image(joule_calc, diagram_type, high_quality=False):
+    """
+    Zeichnet ein Prozessdiagramm und gibt es als Bilddaten für den PDF-Export zurück
+    
+    Parameter:
+    joule_calc : JouleProcessCalculator
+        Instanz des JouleProcessCalculator
+    diagram_type : str
+        Art des Diagramms ('Ts', 'pv', 'hs')
+    high_quality : bool
+        Wenn True, verlustfreies PNG mit 300 dpi, sonst kompaktes JPEG mit 90 dpi
+        
+    Returns:
+    bytes:
+        PNG- bzw. JPEG-Daten des Diagramms
+    """
+    from matplotlib.figure import Figure
+    from visualization.plotting import plot_process
+    
+    # Figur ohne pyplot anlegen: sie wird nur in den Speicher gerendert, so dass
+    # weder ein GUI-Fenster entsteht noch das globale Backend umgestellt werden muss
+    fig = Figure(figsize=(10, 6), dpi=120, constrained_layout=True)
+    plot_process(joule_calc, diagram_type=diagram_type, ax=fig.add_subplot())
+    buf = io.BytesIO()
+    if high_quality:
+        fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
+    else:
+        fig.savefig(buf, format='jpeg', dpi=90, bbox_inches='tight',
+                    pil_kwargs={'quality': 85, 'optimize': True})
+    return buf.getvalue()
+
+
+def export_calculation_to_pdf(joule_calc, output_file, include_plots=True, high_quality=False):
     """
     Exportiert die Berechnung als PDF-Datei mit robuster Unicode-Behandlung
     
@@ -594,99 +827,84 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
         Pfad zur Ausgabedatei
     include_plots : bool
         Wenn True, werden Diagramme im PDF inkludiert
+    high_quality : bool
+        Wenn True, werden die Diagramme verlustfrei mit 300 dpi eingebettet (größere Datei)
     """
     try:
         from fpdf import FPDF
-        import matplotlib.pyplot as plt
-        from visualization.plotting import plot_process
-        import tempfile
-        import os
-        import sys
     except ImportError:
-        print("Für den PDF-Export wird fpdf benötigt. Installieren mit: pip install fpdf")
+        print("Für den PDF-Export wird fpdf2 benötigt. Installieren mit: pip install fpdf2")
         return
     
     class CustomPDF(FPDF):
         """Custom PDF class with Unicode-safe methods"""
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Mit einer TrueType-Schrift werden Sonderzeichen (η, ₂, √, ...) direkt
+            # dargestellt, sonst wird auf die Latin-1-Kernschrift Arial zurückgegriffen
+            font_files = _unicode_font_files()
+            if font_files:
+                for style, path in font_files.items():
+                    self.add_font('DejaVu', style, path)
+                self.font_family_name = 'DejaVu'
+                self.unicode_font = True
+            else:
+                self.font_family_name = 'Arial'
+                self.unicode_font = False
+        
         def header(self):
-            self.set_font('Arial', 'B', 15)
+            self.set_font(self.font_family_name, 'B', 15)
             self.cell(0, 10, 'JOULE-Prozess Berechnungsdokumentation', 0, 1, 'C')
             self.ln(10)
         
         def footer(self):
             self.set_y(-15)
-            self.set_font('Arial', 'I', 8)
+            self.set_font(self.font_family_name, 'I', 8)
             self.cell(0, 10, f'Seite {self.page_no()}', 0, 0, 'C')
         
         def add_cell(self, text, new_line=True, style=''):
             """Add a cell with Unicode-safe text conversion"""
             safe_text = self._make_text_safe(text)
-            self.set_font('Arial', style, 10)
+            self._set_text_font(style)
             self.cell(0, 6, safe_text, 0, 1 if new_line else 0, 'L')
         
         def add_multi_cell(self, text, height=6, style=''):
             """Add a multi-line cell with Unicode-safe text conversion"""
             safe_text = self._make_text_safe(text)
-            self.set_font('Arial', style, 10)
+            self._set_text_font(style)
             self.multi_cell(0, height, safe_text)
+            # Wie nach add_cell in der nächsten Zeile am linken Rand fortfahren
+            self.set_x(self.l_margin)
+        
+        def _set_text_font(self, style):
+            """Select the 10 pt text font, skipping set_font if it is already active"""
+            # Aufeinanderfolgende Zellen verwenden meist denselben Schriftschnitt
+            if self.font_style != style or self.font_size_pt != 10:
+                self.set_font(self.font_family_name, style, 10)
         
         def add_heading(self, text, level=1):
             """Add a heading with Unicode-safe text conversion"""
             safe_text = self._make_text_safe(text)
             if level == 1:
-                self.set_font('Arial', 'B', 16)
+                self.set_font(self.font_family_name, 'B', 16)
                 self.cell(0, 10, safe_text, 0, 1, 'L')
             elif level == 2:
-                self.set_font('Arial', 'B', 14)
+                self.set_font(self.font_family_name, 'B', 14)
                 self.cell(0, 10, safe_text, 0, 1, 'L')
             else:
-                self.set_font('Arial', 'B', 12)
+                self.set_font(self.font_family_name, 'B', 12)
                 self.cell(0, 8, safe_text, 0, 1, 'L')
         
         def _make_text_safe(self, text):
             """Convert any Unicode text to Latin-1 safe equivalent"""
             if not isinstance(text, str):
                 return str(text)
-                
-            # Ersetze Zeichen durch sichere Alternativen
-            replacements = {
-                # Griechische Buchstaben (kleine)
-                'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon',
-                'ζ': 'zeta', 'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa',
-                'λ': 'lambda', 'μ': 'mu', 'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron',
-                'π': 'pi', 'ρ': 'rho', 'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon',
-                'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
-                
-                # Griechische Buchstaben (große)
-                'Α': 'Alpha', 'Β': 'Beta', 'Γ': 'Gamma', 'Δ': 'Delta', 'Ε': 'Epsilon',
-                'Ζ': 'Zeta', 'Η': 'Eta', 'Θ': 'Theta', 'Ι': 'Iota', 'Κ': 'Kappa',
-                'Λ': 'Lambda', 'Μ': 'Mu', 'Ν': 'Nu', 'Ξ': 'Xi', 'Ο': 'Omicron',
-                'Π': 'Pi', 'Ρ': 'Rho', 'Σ': 'Sigma', 'Τ': 'Tau', 'Υ': 'Upsilon',
-                'Φ': 'Phi', 'Χ': 'Chi', 'Ψ': 'Psi', 'Ω': 'Omega',
-                
-                # Tiefgestellte Zahlen
-                '₀': '_0', '₁': '_1', '₂': '_2', '₃': '_3', '₄': '_4',
-                '₅': '_5', '₆': '_6', '₇': '_7', '₈': '_8', '₉': '_9',
-                
-                # Hochgestellte Zahlen
-                '⁰': '^0', '¹': '^1', '²': '^2', '³': '^3', '⁴': '^4',
-                '⁵': '^5', '⁶': '^6', '⁷': '^7', '⁸': '^8', '⁹': '^9',
-                
-                # Thermodynamische Symbole
-                '°': 'deg', '·': '*', '→': '->', '←': '<-', '−': '-',
-                '×': 'x', '≈': '~=', '≠': '!=', '≤': '<=', '≥': '>=',
-                '±': '+/-', '∂': 'd', '∫': 'int', '√': 'sqrt', '∞': 'inf',
-                
-                # Deutsche Umlaute
-                'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss'
-            }
             
-            for char, replacement in replacements.items():
-                text = text.replace(char, replacement)
-                
-            # Entferne alle verbleibenden nicht-Latin1-Zeichen
-            text = ''.join(c for c in text if ord(c) < 256)
-            return text
+            # Reine ASCII-Texte (der Normalfall) müssen nicht umgewandelt werden
+            if text.isascii():
+                return text
+            
+            return _sanitize_pdf_text(text, self.unicode_font)
     
     # PDF-Dokument erstellen
     pdf = CustomPDF()
@@ -709,28 +927,12 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
     # Zustandsgrößen
     pdf.add_heading('Zustandsgrößen', 3)
     
-    # Hilfsfunktion für benutzerdefinierte Sortierung
-    def custom_sort_key(key):
-        if isinstance(key, int):
-            return key, ""
-        else:
-            try:
-                num = int(key.rstrip("*s"))
-                suffix = key[len(str(num)):]
-                return num, suffix
-            except (ValueError, AttributeError):
-                return float('inf'), key
-    
     # Zustände ausgeben
-    for i in sorted(joule_calc.states.keys(), key=custom_sort_key):
+    for i in joule_calc.get_sorted_state_keys():
         state = joule_calc.states[i]
         pdf.add_cell(f"Zustand {i}", style='B')
-        pdf.add_cell(f"p [bar]: {pascal_to_bar(state['p']):.6g}")
-        pdf.add_cell(f"T [K]: {state['T']:.6g}")
-        pdf.add_cell(f"T [°C]: {kelvin_to_celsius(state['T']):.6g}")
-        pdf.add_cell(f"v [m³/kg]: {state['v']:.6g}")
-        pdf.add_cell(f"h [J/kg]: {state['h']:.6g}")
-        pdf.add_cell(f"s [J/(kg·K)]: {state['s']:.6g}")
+        # Alle Zustandsgrößen als ein mehrzeiliger Block
+        pdf.add_multi_cell(_state_display(state))
         pdf.ln(2)
     
     pdf.ln(5)
@@ -740,16 +942,19 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
         props = joule_calc.calculate_process_properties()
         pdf.add_heading('Prozessgrößen', 3)
         
+        # Prozessgrößen sammeln und als ein mehrzeiliger Block ausgeben
+        lines = []
         if 'eta_th' in props:
-            pdf.add_cell(f"eta_th [-]: {props['eta_th']:.4f}")
-        pdf.add_cell(f"w_KP [J/kg]: {props['w_kp']:.2f}")
-        pdf.add_cell(f"q_zu [J/kg]: {props['q_in']:.2f}")
+            lines.append(f"eta_th [-]: {props['eta_th']:.4f}")
+        lines.append(f"w_KP [J/kg]: {props['w_kp']:.2f}")
+        lines.append(f"q_zu [J/kg]: {props['q_in']:.2f}")
         if 'q_out' in props:
-            pdf.add_cell(f"q_ab [J/kg]: {props['q_out']:.2f}")
+            lines.append(f"q_ab [J/kg]: {props['q_out']:.2f}")
         if 'pi' in props:
-            pdf.add_cell(f"pi [-]: {props['pi']:.4f}")
+            lines.append(f"pi [-]: {props['pi']:.4f}")
         if 'tau' in props:
-            pdf.add_cell(f"tau [-]: {props['tau']:.4f}")
+            lines.append(f"tau [-]: {props['tau']:.4f}")
+        pdf.add_multi_cell("\n".join(lines))
         
         pdf.ln(5)
     except Exception as e:
@@ -757,7 +962,14 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
     
     # Diagramme einfügen
     if include_plots:
-        for diagram_type in ['Ts', 'pv', 'hs']:
+        diagram_types = ['Ts', 'pv', 'hs']
+        
+        images = [_render_diagram_image(joule_calc, diagram_type, high_quality) for diagram_type in diagram_types]
+        
+        # Die Diagrammseiten haben ein festes Layout (Überschrift und ein Bild),
+        # der Seitenumbruch muss dort nicht bei jedem Element geprüft werden
+        pdf.set_auto_page_break(False)
+        for diagram_type, image in zip(diagram_types, images):
             pdf.add_page()
             
             if diagram_type == 'Ts':
@@ -767,19 +979,9 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
             else:  # hs
                 pdf.add_heading('h-s-Diagramm', 3)
             
-            # Temporäre Datei für das Diagramm
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp:
-                temp_name = temp.name
-            
-            # Diagramm erzeugen und speichern
-            fig, ax = plot_process(joule_calc, diagram_type=diagram_type, save_fig=True, filename=temp_name)
-            plt.close(fig)
-            
-            # Diagramm in PDF einfügen
-            pdf.image(temp_name, x=10, y=30, w=190)
-            
-            # Temporäre Datei löschen
-            os.unlink(temp_name)
+            # Diagramm direkt aus dem Speicher in PDF einfügen
+            pdf.image(io.BytesIO(image), x=10, y=30, w=190)
+        pdf.set_auto_page_break(True, margin=15)
     
     # Berechnungsschritte
     pdf.add_page()
@@ -790,24 +992,11 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
         pdf.add_heading(f"Kategorie: {category}", 3)
         
         for step in steps:
-            pdf.add_cell(step['title'], style='B')
-            
-            if step['formula']:
-                pdf.add_cell(f"Formel: {step['formula']}", style='I')
-            
-            if step['calculation']:
-                # Lange Berechnungstexte aufteilen
-                calc_text = step['calculation']
-                chunks = [calc_text[i:i+80] for i in range(0, len(calc_text), 80)]
-                
-                pdf.add_cell(f"Berechnung: {chunks[0]}")
-                for chunk in chunks[1:]:
-                    pdf.add_cell(chunk)
-            
-            if step['result'] is not None:
-                result_str = f"{step['result']:.6g}" if isinstance(step['result'], float) else str(step['result'])
-                unit_str = f" {step['unit']}" if step['unit'] else ""
-                pdf.add_cell(f"Ergebnis: {result_str}{unit_str}", style='B')
+            for style, text, wrap in _expand_step(step):
+                if wrap:
+                    pdf.add_multi_cell(text, style=style)
+                else:
+                    pdf.add_cell(text, style=style)
             
             pdf.ln(2)
     
@@ -820,16 +1009,4 @@ def export_calculation_to_pdf(joule_calc, output_file, include_plots=True):
         
         # Detaillierte Fehlerinformationen für Debugging
         import traceback
-        traceback.print_exc()
-        
-        # Versuche alternativen Speicheransatz
-        try:
-            print("Versuche alternativen Speicheransatz...")
-            # Bei älteren FPDF-Versionen kann es helfen, erst in Bytes zu konvertieren
-            with open(output_file, 'wb') as f:
-                f.write(pdf.output(dest='S').encode('latin1'))
-            print(f"PDF wurde mit alternativem Ansatz gespeichert in {output_file}")
-        except Exception as e2:
-            print(f"Auch alternativer Ansatz fehlgeschlagen: {e2}")
-            print("Bitte aktualisieren Sie Ihre FPDF-Installation: pip install --upgrade fpdf")
-            print("Oder versuchen Sie FPDF2: pip install fpdf2")
\ No newline at end of file
+        traceback.print_exc()
\ No newline at end of file